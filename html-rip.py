@@ -21,22 +21,85 @@ Notes:
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import contextlib
 import os
 import re
 import sys
+import threading
 import hashlib
+from html import unescape
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
 from urllib.parse import urljoin, urlparse, urldefrag, unquote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
+try:
+    import httpx  # optional: only used with --http2
+except ImportError:
+    httpx = None
+
 
 USER_AGENT = "Mozilla/5.0 (compatible; SiteRipper/1.0)"
 TIMEOUT = 25
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB safety limit
-
-
-SKIP_SCHEMES = {"data", "mailto", "tel", "javascript"}
+CHUNK_SIZE = 64 * 1024  # streaming read size
+MAX_WORKERS = 64  # concurrent asset downloads across all hosts
+MAX_PER_HOST = 8  # concurrent requests to any single host
+POOL_CONNECTIONS = 32  # distinct hosts kept in the connection pool
+POOL_MAXSIZE = 64  # keep-alive connections per host (>= MAX_PER_HOST)
+HTTP2_MAX_CONNECTIONS = 16  # --http2: streams are multiplexed, so few connections are needed
+
+
+SKIP_SCHEMES = frozenset({"data", "mailto", "tel", "javascript"})
+IMAGE_EXTS = frozenset({".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".avif", ".bmp"})
+
+CTYPE_EXT = {
+    "text/css": ".css",
+    "text/javascript": ".js",
+    "application/javascript": ".js",
+    "application/x-javascript": ".js",
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/svg+xml": ".svg",
+    "image/x-icon": ".ico",
+    "image/vnd.microsoft.icon": ".ico",
+    "image/avif": ".avif",
+}
+ASSET_TAGS = ["link", "script", "img", "source", "meta"]  # tags that can reference assets
+
+# Raw-HTML scanning for asset tags (quoted attribute values may contain '>').
+# Comments and <script>/<style>/<textarea>/<title> bodies are matched as a whole
+# so tag-like text inside them (commented-out markup, JS string templates) is
+# stepped over, and the opening tag of every other element is consumed so its
+# attribute values (e.g. <iframe srcdoc="<img ...>">) are too.
+_TAG_ATTRS = r"""(?:"[^"]*"|'[^']*'|[^'">])*"""
+ASSET_TAG_RE = re.compile(
+    r"<!--.*?-->"
+    rf"|<(?P<raw>style|textarea|title)\b{_TAG_ATTRS}>.*?</(?P=raw)\s*>"
+    rf"|<script\b(?P<script_attrs>{_TAG_ATTRS})>.*?</script\s*>"
+    rf"|<(?P<name>link|img|source|meta)\b(?P<attrs>{_TAG_ATTRS})>"
+    rf"|</?[a-z][^\s/>]*{_TAG_ATTRS}>",
+    re.IGNORECASE | re.DOTALL,
+)
+TAG_ATTR_RE = re.compile(r"""([^\s"'>/=]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+
+# CSS url(...) / @import references
+URL_FUNC_RE = re.compile(r"url\(\s*(['\"]?)(.*?)\1\s*\)", re.IGNORECASE)
+URL_OPEN_RE = re.compile(r"url\(", re.IGNORECASE)
+CSS_WHITESPACE = " \t\r\n\f"
+IMPORT_RE = re.compile(r"@import\s+(?:url\()?['\"](.*?)['\"]\)?", re.IGNORECASE)
+
+SCHEME_RE = re.compile(r"^https?://", re.IGNORECASE)
+SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
 
 
 def prompt_nonempty(prompt: str) -> str:
@@ -52,7 +115,7 @@ def ensure_dir(path: str) -> None:
 
 def normalize_url(url: str) -> str:
     url = url.strip()
-    if not re.match(r"^https?://", url, re.IGNORECASE):
+    if not SCHEME_RE.match(url):
         url = "https://" + url
     return url
 
@@ -65,29 +128,39 @@ def is_http_url(u: str) -> bool:
         return False
 
 
-def safe_filename(name: str) -> str:
-    name = unquote(name).strip()
-    name = re.sub(r"[^A-Za-z0-9._-]+", "_", name)
-    name = name.strip("._")
-    return name or "file"
+def name_parts_from_url(url: str, content_type: str, default: str) -> tuple[str, str]:
+    """
+    Returns a filesystem-safe (stem, ext) for a URL in one pass over its last
+    path segment. ext falls back to the content type; stem to default when the
+    path has no last segment, or "file" when it sanitizes to nothing.
+    """
+    base = urlparse(url).path.rpartition("/")[2]
+    if not base:
+        return default, choose_ext_from_ctype(content_type)
 
+    base = SAFE_NAME_RE.sub("_", unquote(base).strip()).strip("._") or "file"
 
-def filename_from_url(url: str, default: str) -> str:
-    p = urlparse(url)
-    base = os.path.basename(p.path)
-    if not base:
-        return default
-    return safe_filename(base)
+    stem, dot, ext = base.rpartition(".")
+    if not dot:
+        return base, choose_ext_from_ctype(content_type)
+    return stem.strip("._") or "file", "." + ext
 
 
+@lru_cache(maxsize=4096)
 def short_hash(s: str) -> str:
-    return hashlib.sha1(s.encode("utf-8", errors="ignore")).hexdigest()[:10]
+    # 5-byte BLAKE2b digest: same 10-hex-char length as the old truncated SHA-1
+    return hashlib.blake2b(s.encode("utf-8", errors="ignore"), digest_size=5).hexdigest()
 
 
 def join_and_clean(base_url: str, ref: str) -> str | None:
     if not ref:
         return None
-    ref = ref.strip()
+    return _join_and_clean(base_url, ref.strip())
+
+
+@lru_cache(maxsize=4096)
+def _join_and_clean(base_url: str, ref: str) -> str | None:
+    # Memoized: the same refs recur across tags, srcsets and stylesheets
     parsed = urlparse(ref)
     if parsed.scheme and parsed.scheme.lower() in SKIP_SCHEMES:
         return None
@@ -99,24 +172,138 @@ def join_and_clean(base_url: str, ref: str) -> str | None:
     return absolute
 
 
-def fetch_bytes(url: str, session: requests.Session) -> tuple[bytes, str, str]:
+class HostLimitedPool:
     """
-    Returns (content_bytes, final_url, content_type)
+    Thread pool front-end that runs at most per_host jobs for any one host at a
+    time, so a big pool doesn't hammer a single origin (429s/bans).
+    Jobs over the limit wait in a per-host queue rather than inside a worker:
+    pool threads are only handed jobs that can start right away, so jobs for
+    other hosts use the remaining workers.
     """
-    r = session.get(url, timeout=TIMEOUT, allow_redirects=True, stream=True)
-    r.raise_for_status()
 
-    # size guard (best-effort)
-    cl = r.headers.get("Content-Length")
+    def __init__(self, max_workers: int, per_host: int) -> None:
+        self.ex = ThreadPoolExecutor(max_workers=max_workers)
+        self.per_host = per_host
+        self.lock = threading.Lock()
+        self.active: defaultdict[str, int] = defaultdict(int)
+        self.waiting: defaultdict[str, deque] = defaultdict(deque)
+
+    def __enter__(self) -> HostLimitedPool:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.ex.shutdown(wait=True)
+
+    def submit(self, host: str, fn, *args) -> Future:
+        fut: Future = Future()
+        with self.lock:
+            if self.active[host] >= self.per_host:
+                self.waiting[host].append((fut, fn, args))
+                return fut
+            self.active[host] += 1
+        fut.set_running_or_notify_cancel()
+        self._run(host, fut, fn, args)
+        return fut
+
+    def _run(self, host: str, fut: Future, fn, args) -> None:
+        self.ex.submit(fn, *args).add_done_callback(partial(self._finished, host, fut))
+
+    def _finished(self, host: str, fut: Future, inner: Future) -> None:
+        self._next(host)
+        exc = inner.exception()
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(inner.result())
+
+    def _next(self, host: str) -> None:
+        # hand the host's slot to its next queued job, or give it back
+        while True:
+            with self.lock:
+                if not self.waiting[host]:
+                    self.active[host] -= 1
+                    return
+                fut, fn, args = self.waiting[host].popleft()
+            if fut.set_running_or_notify_cancel():  # False: cancelled while queued
+                self._run(host, fut, fn, args)
+                return
+
+
+def probe_ctype(url: str, session: requests.Session) -> str:
+    """
+    HEAD request for the content type; "" if the server won't say
+    (405 Method Not Allowed, invalid URL, other errors).
+    """
+    try:
+        r = session.head(url, timeout=TIMEOUT, allow_redirects=True)
+    except Exception:
+        # any failure (network, invalid URL, ...) leaves it to the GET to decide
+        return ""
+    if not r.ok:
+        return ""
+    return content_type_of(r.headers)
+
+
+def content_type_of(headers) -> str:
+    return headers.get("Content-Type", "").split(";")[0].strip().lower()
+
+
+def check_headers(headers) -> str:
+    """
+    Header checks shared by the requests and httpx downloaders: rejects bodies
+    over MAX_FILE_SIZE by Content-Length (best-effort) and returns the bare
+    content type.
+    """
+    cl = headers.get("Content-Length")
     if cl and cl.isdigit() and int(cl) > MAX_FILE_SIZE:
         raise ValueError(f"File too large (Content-Length={cl})")
+    return content_type_of(headers)
+
 
-    content = r.content
-    if len(content) > MAX_FILE_SIZE:
-        raise ValueError("File too large (downloaded size exceeded limit)")
+@contextlib.contextmanager
+def part_writer(path: str, tag: str):
+    """
+    Yields write(chunk) for streaming a body into <path>.<tag>.part. The size
+    limit is enforced per chunk; on success the file is renamed into place,
+    on any failure the partial file is removed.
+    """
+    part = f"{path}.{tag}.part"
+    size = 0
+    try:
+        with open(part, "wb") as f:
+            def write(chunk: bytes) -> None:
+                nonlocal size
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise ValueError("File too large (downloaded size exceeded limit)")
+                f.write(chunk)
+
+            yield write
+        os.replace(part, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(part)
+        raise
+
+
+def fetch_to_path(url: str, session: requests.Session, path_for) -> tuple[str, str] | None:
+    """
+    Streams a download straight to disk. path_for(final_url, content_type) is called
+    once the headers are in and returns the destination path, or None to skip the
+    body. Returns (final_url, local_path), or None if skipped.
+    The body goes to a temporary .part file that is renamed into place when complete.
+    """
+    with session.get(url, timeout=TIMEOUT, allow_redirects=True, stream=True) as r:
+        r.raise_for_status()
+        path = path_for(r.url, check_headers(r.headers))
+        if path is None:
+            return None
 
-    ctype = r.headers.get("Content-Type", "").split(";")[0].strip().lower()
-    return content, r.url, ctype
+        # per-thread temp name: two URLs may redirect to the same final file
+        with part_writer(path, str(threading.get_ident())) as write:
+            for chunk in r.iter_content(CHUNK_SIZE):
+                write(chunk)
+        return r.url, path
 
 
 def fetch_text(url: str, session: requests.Session) -> tuple[str, str]:
@@ -127,14 +314,8 @@ def fetch_text(url: str, session: requests.Session) -> tuple[str, str]:
     return r.text, r.url
 
 
-def write_bytes(path: str, data: bytes) -> None:
-    ensure_dir(os.path.dirname(path))
-    with open(path, "wb") as f:
-        f.write(data)
-
-
 def write_text(path: str, text: str) -> None:
-    ensure_dir(os.path.dirname(path))
+    # Parent directories are created up front by AssetStore / main()
     with open(path, "w", encoding="utf-8") as f:
         f.write(text)
 
@@ -145,20 +326,7 @@ def relpath_web(from_dir: str, to_path: str) -> str:
 
 
 def choose_ext_from_ctype(ctype: str) -> str:
-    return {
-        "text/css": ".css",
-        "text/javascript": ".js",
-        "application/javascript": ".js",
-        "application/x-javascript": ".js",
-        "image/png": ".png",
-        "image/jpeg": ".jpg",
-        "image/gif": ".gif",
-        "image/webp": ".webp",
-        "image/svg+xml": ".svg",
-        "image/x-icon": ".ico",
-        "image/vnd.microsoft.icon": ".ico",
-        "image/avif": ".avif",
-    }.get(ctype, "")
+    return CTYPE_EXT.get(ctype, "")
 
 
 def extract_urls_from_css(css_text: str) -> list[str]:
@@ -168,14 +336,42 @@ def extract_urls_from_css(css_text: str) -> list[str]:
     """
     urls = []
 
-    # url(...)
-    for m in re.finditer(r"url\(\s*(['\"]?)(.*?)\1\s*\)", css_text, flags=re.IGNORECASE):
-        ref = m.group(2).strip()
+    # url(...): the regex only finds "url(", the argument is scanned by hand
+    n = len(css_text)
+    pos = 0
+    while True:
+        m = URL_OPEN_RE.search(css_text, pos)
+        if not m:
+            break
+        i = m.end()
+        while i < n and css_text[i] in CSS_WHITESPACE:
+            i += 1
+        quote = css_text[i] if i < n and css_text[i] in "'\"" else ""
+        if quote:
+            i += 1
+
+        # find the terminator, stepping over backslash escapes (\" or \))
+        term = quote or ")"
+        end = css_text.find(term, i)
+        esc = css_text.find("\\", i, end)
+        while end != -1 and esc != -1:
+            end = css_text.find(term, esc + 2)
+            esc = css_text.find("\\", esc + 2, end)
+        if end == -1:
+            break
+        pos = end + 1
+
+        # data: URIs are never downloaded; skipping past them also avoids
+        # picking up url(...) references nested inside inline SVG
+        if css_text[i:i + 5].lower() == "data:":
+            continue
+
+        ref = css_text[i:end].strip()
         if ref:
             urls.append(ref)
 
     # @import
-    for m in re.finditer(r"@import\s+(?:url\()?['\"](.*?)['\"]\)?", css_text, flags=re.IGNORECASE):
+    for m in IMPORT_RE.finditer(css_text):
         ref = m.group(1).strip()
         if ref:
             urls.append(ref)
@@ -183,6 +379,23 @@ def extract_urls_from_css(css_text: str) -> list[str]:
     return urls
 
 
+def rewrite_css_refs(css_text: str, ref_to_local: dict[str, str]) -> str:
+    """
+    Rewrites url(...) and @import refs in a single regex pass each.
+    Only exact refs found in ref_to_local are replaced, so "a.png" never
+    touches "logo-a.png"; everything else is left as-is.
+    """
+    def replace_group(m: re.Match, group: int) -> str:
+        local = ref_to_local.get(m.group(group).strip())
+        if local is None:
+            return m.group(0)
+        start, end = m.start(group) - m.start(), m.end(group) - m.start()
+        return m.group(0)[:start] + local + m.group(0)[end:]
+
+    css_text = URL_FUNC_RE.sub(lambda m: replace_group(m, 2), css_text)
+    return IMPORT_RE.sub(lambda m: replace_group(m, 1), css_text)
+
+
 def parse_srcset(srcset: str) -> list[str]:
     """
     srcset="a.jpg 1x, b.jpg 2x" -> ["a.jpg","b.jpg"]
@@ -199,29 +412,35 @@ def parse_srcset(srcset: str) -> list[str]:
 
 
 class AssetStore:
+    """
+    Tracks downloaded assets and where they live under dest_root.
+    Every directory local_path_for() can return is created here, once, so
+    the write helpers never have to check for missing parents.
+    """
+
     def __init__(self, dest_root: str):
         self.dest_root = dest_root
         self.map_url_to_local: dict[str, str] = {}
+        self.map_local_to_url: dict[str, str] = {}  # inverse of map_url_to_local
+        self.probed_ctypes: dict[str, str] = {}  # url -> content type from HEAD
 
         self.css_dir = os.path.join(dest_root, "css")
         self.js_dir = os.path.join(dest_root, "js")
         self.img_dir = os.path.join(dest_root, "img")
+        self.other_dir = os.path.join(dest_root, "assets")
         ensure_dir(self.css_dir)
         ensure_dir(self.js_dir)
         ensure_dir(self.img_dir)
+        ensure_dir(self.other_dir)
 
     def local_path_for(self, kind: str, final_url: str, content_type: str) -> str:
         """
         kind: css|js|img|other
         """
-        base_name = filename_from_url(final_url, default=kind)
-        ext = os.path.splitext(base_name)[1]
-        if not ext:
-            ext = choose_ext_from_ctype(content_type)
+        stem, ext = name_parts_from_url(final_url, content_type, default=kind)
 
         # Make name stable and avoid collisions
-        stem = os.path.splitext(base_name)[0]
-        name = f"{safe_filename(stem)}_{short_hash(final_url)}{ext or ''}"
+        name = f"{stem}_{short_hash(final_url)}{ext}"
 
         if kind == "css":
             return os.path.join(self.css_dir, name)
@@ -229,226 +448,505 @@ class AssetStore:
             return os.path.join(self.js_dir, name)
         if kind == "img":
             return os.path.join(self.img_dir, name)
-        return os.path.join(self.dest_root, "assets", name)
+        return os.path.join(self.other_dir, name)
 
 
-def main() -> None:
-    print("=== Website Ripper (HTML + CSS + JS + images) ===")
-    start_url = normalize_url(prompt_nonempty("Enter website URL (e.g. https://example.com): "))
-    dest = os.path.abspath(os.path.expanduser(prompt_nonempty("Enter destination folder: ")))
-    ensure_dir(dest)
+def download_css(url: str, session: requests.Session, store: AssetStore) -> tuple[str, str, str] | None:
+    """
+    Downloads a stylesheet and returns (final_url, local_path, css_text).
+    The text is kept so the CSS pass doesn't have to read the file back.
+    """
+    try:
+        return save_css(store, *fetch_text(url, session))
+    except Exception:
+        return None
 
-    session = requests.Session()
-    session.headers.update({"User-Agent": USER_AGENT})
 
-    store = AssetStore(dest)
+def save_css(store: AssetStore, css_text: str, css_final: str) -> tuple[str, str, str]:
+    local = store.local_path_for("css", css_final, "text/css")
+    write_text(local, css_text)
+    return css_final, local, css_text
 
-    # ---- Fetch HTML ----
-    try:
-        html, final_url = fetch_text(start_url, session)
-    except requests.RequestException as e:
-        raise SystemExit(f"Failed to fetch HTML: {e}") from e
 
-    soup = BeautifulSoup(html, "html.parser")
+def js_path_for(store: AssetStore, js_final: str, ctype: str) -> str:
+    # Force .js if content-type hints it or if URL looks like JS
+    return store.local_path_for("js", js_final, ctype or "application/javascript")
 
-    # ---- Inline style blocks -> css/inline_styles.css ----
-    inline_css_parts: list[str] = []
-    for style_tag in soup.find_all("style"):
-        css_text = style_tag.get_text("\n", strip=False)
-        if css_text.strip():
-            inline_css_parts.append(css_text)
-        style_tag.decompose()
 
-    if inline_css_parts:
-        inline_css_rel = "css/inline_styles.css"
-        inline_css_full = os.path.join(dest, inline_css_rel)
-        write_text(inline_css_full, "\n\n/* ---- inline style separator ---- */\n\n".join(inline_css_parts))
+def image_path_for(store: AssetStore, final_u: str, ctype: str) -> str | None:
+    if not ctype.startswith("image/"):
+        # Not an image; skip (keeps it simple/safe)
+        return None
+    return store.local_path_for("img", final_u, ctype)
 
-        # Ensure head exists
-        if soup.head is None:
-            if soup.html is None:
-                soup.append(soup.new_tag("html"))
-            soup.html.insert(0, soup.new_tag("head"))
-        soup.head.append(soup.new_tag("link", rel="stylesheet", href=inline_css_rel))
 
-    downloaded_css = []
-    downloaded_js = []
-    downloaded_img = []
+def needs_probe(url: str, store: AssetStore) -> bool:
+    """
+    Refs that don't look like images (fonts, pages, extensionless URLs) get a HEAD
+    first, so a non-image body is never requested; failed probes fall back to GET.
+    True if url should be probed and hasn't been yet.
+    """
+    if url in store.probed_ctypes:
+        return False
+    return os.path.splitext(urlparse(url).path)[1].lower() not in IMAGE_EXTS
 
-    # ---- Download external CSS and rewrite links ----
-    for link_tag in soup.find_all("link"):
-        rel = link_tag.get("rel") or []
-        rel = [r.lower() for r in rel]
 
-        href = link_tag.get("href")
-        if not href:
-            continue
+def probe_rejected(url: str, store: AssetStore) -> bool:
+    # "" means unknown (not probed, or the probe failed): let the GET decide
+    probed = store.probed_ctypes.get(url, "")
+    return bool(probed) and not probed.startswith("image/")
 
-        # Stylesheet
-        if "stylesheet" in rel:
-            css_url = join_and_clean(final_url, href)
-            if not css_url:
-                continue
-            if css_url in store.map_url_to_local:
-                link_tag["href"] = relpath_web(dest, store.map_url_to_local[css_url])
-                continue
 
-            try:
-                css_text, css_final = fetch_text(css_url, session)
-            except requests.RequestException:
-                continue
+def download_js(url: str, session: requests.Session, store: AssetStore) -> tuple[str, str] | None:
+    """
+    Downloads a script and returns (final_url, local_path).
+    """
+    try:
+        return fetch_to_path(url, session, partial(js_path_for, store))
+    except Exception:
+        return None
 
-            local = store.local_path_for("css", css_final, "text/css")
-            write_text(local, css_text)
-            store.map_url_to_local[css_url] = local
-            downloaded_css.append((css_final, local))
-            link_tag["href"] = relpath_web(dest, local)
 
-        # Icons (treat as images)
-        if any(r in rel for r in ("icon", "shortcut icon", "apple-touch-icon", "mask-icon")):
-            icon_url = join_and_clean(final_url, href)
-            if not icon_url:
-                continue
-            local_rel = download_image(icon_url, session, store, dest, downloaded_img)
-            if local_rel:
-                link_tag["href"] = local_rel
-
-    # ---- Download external JS and rewrite script src ----
-    for script_tag in soup.find_all("script"):
-        src = script_tag.get("src")
-        if not src:
-            continue
+def download_image(url: str, session: requests.Session, store: AssetStore) -> tuple[str, str] | None:
+    """
+    Downloads an image-like asset and returns (final_url, local_path).
+    Anything that is not served as image/* is skipped.
+    """
+    if needs_probe(url, store):
+        store.probed_ctypes[url] = probe_ctype(url, session)
+    if probe_rejected(url, store):
+        return None
 
-        js_url = join_and_clean(final_url, src)
-        if not js_url:
-            continue
+    try:
+        return fetch_to_path(url, session, partial(image_path_for, store))
+    except Exception:
+        return None
 
-        if js_url in store.map_url_to_local:
-            script_tag["src"] = relpath_web(dest, store.map_url_to_local[js_url])
-            continue
+
+DOWNLOADERS = {"css": download_css, "js": download_js, "img": download_image}
+
+
+class Http2Downloader:
+    """
+    Optional HTTP/2 transport for asset downloads (--http2).
+    One httpx.AsyncClient runs on a background event loop, so concurrent requests
+    to the same origin are multiplexed over a single TLS connection instead of one
+    socket per worker. Origins without h2 are negotiated down to HTTP/1.1 by ALPN.
+    submit() returns a concurrent.futures.Future, like ThreadPoolExecutor.submit().
+    Only the transport calls live here; checks and file handling are shared with
+    the requests path. File writes run on the loop thread on purpose: they are
+    64 KiB chunks into the page cache, cheaper than a thread hand-off per chunk.
+    """
+
+    def __init__(self) -> None:
+        if httpx is None:
+            raise ImportError("httpx is not installed")
+        # raises ImportError if the h2 extra is missing
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=HTTP2_MAX_CONNECTIONS, max_keepalive_connections=HTTP2_MAX_CONNECTIONS),
+            timeout=TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        )
+        # only touched from the event loop thread, so no lock needed
+        self.host_slots: defaultdict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(MAX_PER_HOST))
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def submit(self, kind: str, url: str, store: AssetStore) -> Future:
+        return asyncio.run_coroutine_threadsafe(self.DOWNLOADERS[kind](self, url, store), self.loop)
+
+    def close(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.client.aclose(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def fetch_text(self, url: str) -> tuple[str, str]:
+        async with self.host_slots[urlparse(url).netloc]:
+            r = await self.client.get(url)
+        r.raise_for_status()
+        if not r.charset_encoding:
+            r.encoding = "utf-8"
+        return r.text, str(r.url)
+
+    async def probe_ctype(self, url: str) -> str:
+        try:
+            async with self.host_slots[urlparse(url).netloc]:
+                r = await self.client.head(url)
+        except Exception:
+            # any failure (network, invalid URL, ...) leaves it to the GET to decide
+            return ""
+        if not r.is_success:
+            return ""
+        return content_type_of(r.headers)
+
+    async def fetch_to_path(self, url: str, path_for) -> tuple[str, str] | None:
+        # Same contract as the module-level fetch_to_path()
+        async with self.host_slots[urlparse(url).netloc], self.client.stream("GET", url) as r:
+            r.raise_for_status()
+            path = path_for(str(r.url), check_headers(r.headers))
+            if path is None:
+                return None
+
+            # all coroutines share one thread, so key the temp name on the URL
+            with part_writer(path, short_hash(url)) as write:
+                async for chunk in r.aiter_bytes(CHUNK_SIZE):
+                    write(chunk)
+            return str(r.url), path
+
+    async def download_css(self, url: str, store: AssetStore) -> tuple[str, str, str] | None:
+        try:
+            return save_css(store, *await self.fetch_text(url))
+        except Exception:
+            return None
+
+    async def download_js(self, url: str, store: AssetStore) -> tuple[str, str] | None:
+        try:
+            return await self.fetch_to_path(url, partial(js_path_for, store))
+        except Exception:
+            return None
+
+    async def download_image(self, url: str, store: AssetStore) -> tuple[str, str] | None:
+        if needs_probe(url, store):
+            store.probed_ctypes[url] = await self.probe_ctype(url)
+        if probe_rejected(url, store):
+            return None
 
         try:
-            data, js_final, ctype = fetch_bytes(js_url, session)
+            return await self.fetch_to_path(url, partial(image_path_for, store))
         except Exception:
+            return None
+
+    DOWNLOADERS = {"css": download_css, "js": download_js, "img": download_image}
+
+
+def submit_downloads(ex: HostLimitedPool, jobs: dict[str, str], session: requests.Session, store: AssetStore, in_flight: dict, http2: Http2Downloader | None = None) -> None:
+    """
+    Submits every {absolute_url: kind} job that is neither downloaded nor
+    already in flight. in_flight maps url -> (kind, future).
+    With http2, downloads go through the HTTP/2 client instead of the thread pool.
+    """
+    for u, kind in jobs.items():
+        if u in store.map_url_to_local or u in in_flight:
+            continue
+        if http2 is not None:
+            in_flight[u] = (kind, http2.submit(kind, u, store))
+        else:
+            in_flight[u] = (kind, ex.submit(urlparse(u).netloc, DOWNLOADERS[kind], u, session, store))
+
+
+def collect_downloads(in_flight: dict, store: AssetStore, downloaded: dict[str, list], wanted=None) -> None:
+    """
+    Waits for everything in in_flight (and empties it). Workers only fetch and
+    write files; store.map_url_to_local and the downloaded[kind] lists are
+    updated from the calling thread. downloaded[kind] gets the downloader's
+    result tuple: (final_url, local_path), plus css_text for stylesheets.
+    If wanted is given, downloads of URLs not in it are discarded and their
+    files removed.
+    """
+    futures = {fut: (u, kind) for u, (kind, fut) in in_flight.items()}
+    in_flight.clear()
+    unwanted = []
+    for fut in as_completed(futures):
+        result = fut.result()
+        if not result:
             continue
+        u, kind = futures[fut]
+        local = result[1]
+        if wanted is not None and u not in wanted:
+            unwanted.append(local)
+            continue
+        store.map_url_to_local[u] = local
+        # first URL saved to a local path wins, as the old reverse scan did
+        store.map_local_to_url.setdefault(local, u)
+        downloaded[kind].append(result)
+
+    for local in unwanted:
+        if local not in store.map_local_to_url:  # may be shared via a redirect
+            with contextlib.suppress(OSError):
+                os.remove(local)
+
 
-        # Force .js if content-type hints it or if URL looks like JS
-        if not ctype:
-            ctype = "application/javascript"
-
-        local = store.local_path_for("js", js_final, ctype)
-        write_bytes(local, data)
-        store.map_url_to_local[js_url] = local
-        downloaded_js.append((js_final, local))
-        script_tag["src"] = relpath_web(dest, local)
-
-    # ---- Download images referenced in HTML ----
-    # <img src>
-    for img_tag in soup.find_all("img"):
-        src = img_tag.get("src")
-        if src:
-            absu = join_and_clean(final_url, src)
+def download_all(ex: HostLimitedPool, jobs: dict[str, str], session: requests.Session, store: AssetStore, downloaded: dict[str, list], http2: Http2Downloader | None = None) -> None:
+    """
+    Downloads every {absolute_url: kind} job on the pool and waits for them.
+    """
+    in_flight: dict = {}
+    submit_downloads(ex, jobs, session, store, in_flight, http2)
+    collect_downloads(in_flight, store, downloaded)
+
+
+def asset_refs(name: str, attrs, base_url: str) -> list[tuple[str, str, list[str]]]:
+    """
+    Returns the (attr, kind, [absolute_url, ...]) asset references carried by one tag.
+    attrs is anything with .get(): a BeautifulSoup tag or a plain attribute dict.
+    """
+    refs = []
+
+    # <link rel=stylesheet> and icons
+    if name == "link":
+        rel = attrs.get("rel") or []
+        if isinstance(rel, str):
+            rel = rel.split()
+        rel = [r.lower() for r in rel]
+
+        absu = join_and_clean(base_url, attrs.get("href") or "")
+        if absu:
+            # Stylesheet
+            if "stylesheet" in rel:
+                refs.append(("href", "css", [absu]))
+            # Icons (treat as images)
+            elif any(r in rel for r in ("icon", "shortcut icon", "apple-touch-icon", "mask-icon")):
+                refs.append(("href", "img", [absu]))
+
+    # <script src>
+    elif name == "script":
+        absu = join_and_clean(base_url, attrs.get("src") or "")
+        if absu:
+            refs.append(("src", "js", [absu]))
+
+    # <img src>, <img srcset>, <source srcset> (e.g. in <picture>)
+    elif name in ("img", "source"):
+        if name == "img":
+            absu = join_and_clean(base_url, attrs.get("src") or "")
             if absu:
-                local_rel = download_image(absu, session, store, dest, downloaded_img)
-                if local_rel:
-                    img_tag["src"] = local_rel
+                refs.append(("src", "img", [absu]))
 
-        # srcset
-        srcset = img_tag.get("srcset")
+        srcset = attrs.get("srcset")
         if srcset:
-            urls = parse_srcset(srcset)
-            new_parts = []
-            for u in urls:
-                absu = join_and_clean(final_url, u)
-                if not absu:
-                    continue
-                local_rel = download_image(absu, session, store, dest, downloaded_img)
-                if local_rel:
-                    new_parts.append(f"{local_rel} 1x")
-            if new_parts:
-                img_tag["srcset"] = ", ".join(new_parts)
-
-    # <source srcset> (e.g. in <picture>)
-    for source_tag in soup.find_all("source"):
-        srcset = source_tag.get("srcset")
-        if not srcset:
-            continue
-        urls = parse_srcset(srcset)
-        new_parts = []
-        for u in urls:
-            absu = join_and_clean(final_url, u)
-            if not absu:
-                continue
-            local_rel = download_image(absu, session, store, dest, downloaded_img)
-            if local_rel:
-                new_parts.append(f"{local_rel} 1x")
-        if new_parts:
-            source_tag["srcset"] = ", ".join(new_parts)
+            urls = [absu for absu in (join_and_clean(base_url, u) for u in parse_srcset(srcset)) if absu]
+            if urls:
+                refs.append(("srcset", "img", urls))
 
     # Meta images (OpenGraph/Twitter)
-    for meta in soup.find_all("meta"):
-        prop = (meta.get("property") or "").lower()
-        name = (meta.get("name") or "").lower()
-        if prop in ("og:image", "og:image:url") or name in ("twitter:image", "twitter:image:src"):
-            content = meta.get("content")
-            absu = join_and_clean(final_url, content or "")
+    elif name == "meta":
+        prop = (attrs.get("property") or "").lower()
+        meta_name = (attrs.get("name") or "").lower()
+        if prop in ("og:image", "og:image:url") or meta_name in ("twitter:image", "twitter:image:src"):
+            absu = join_and_clean(base_url, attrs.get("content") or "")
             if absu:
-                local_rel = download_image(absu, session, store, dest, downloaded_img)
-                if local_rel:
-                    meta["content"] = local_rel
+                refs.append(("content", "img", [absu]))
 
-    # ---- Parse downloaded CSS for url(...) images and @import CSS ----
-    # We will:
-    # - For each downloaded CSS: download url(...) assets that look like images
-    # - For @import: try to download additional CSS and rewrite (best-effort)
-    for _remote, css_local in downloaded_css:
-        try:
-            css_text = open(css_local, "r", encoding="utf-8", errors="replace").read()
-        except OSError:
+    return refs
+
+
+def collect_asset_jobs(soup: BeautifulSoup, base_url: str) -> tuple[list[tuple], list[str]]:
+    """
+    Single walk over the soup. Returns (jobs, inline_css_parts):
+    - jobs: (tag, attr, kind, [absolute_url, ...]) for every asset reference
+    - inline_css_parts: the text of each inline <style> block, which is removed
+    Nothing is downloaded or rewritten here.
+    """
+    jobs = []
+    inline_css_parts: list[str] = []
+    for tag in soup.find_all(["style", *ASSET_TAGS]):
+        if tag.name == "style":
+            css_text = tag.get_text("\n", strip=False)
+            if css_text.strip():
+                inline_css_parts.append(css_text)
+            tag.decompose()
             continue
 
-        css_base_url = None
-        # Find the original remote URL for this local css if possible
-        # (reverse map)
-        for k, v in store.map_url_to_local.items():
-            if v == css_local:
-                css_base_url = k
-                break
-        if not css_base_url:
+        for attr, kind, urls in asset_refs(tag.name, tag, base_url):
+            jobs.append((tag, attr, kind, urls))
+    return jobs, inline_css_parts
+
+
+def harvest_asset_urls(html: str, base_url: str) -> dict[str, str]:
+    """
+    Regex pass over the raw HTML that finds asset tags without building a tree.
+    Returns deduplicated {absolute_url: kind} jobs. Best-effort: the soup walk in
+    collect_asset_jobs() stays authoritative for what gets rewritten.
+    """
+    jobs: dict[str, str] = {}
+    for tag_m in ASSET_TAG_RE.finditer(html):
+        if tag_m.group("script_attrs") is not None:
+            name, attrs_text = "script", tag_m.group("script_attrs")
+        elif tag_m.group("name"):
+            name, attrs_text = tag_m.group("name").lower(), tag_m.group("attrs")
+        else:
+            continue  # comment, raw-text block or some other tag
+
+        attrs = {}
+        for attr_m in TAG_ATTR_RE.finditer(attrs_text):
+            value = next(v for v in attr_m.group(2, 3, 4) if v is not None)
+            attrs.setdefault(attr_m.group(1).lower(), unescape(value))
+
+        for _attr, kind, urls in asset_refs(name, attrs, base_url):
+            for absu in urls:
+                jobs.setdefault(absu, kind)
+    return jobs
+
+
+def asset_urls(asset_jobs: list[tuple]) -> dict[str, str]:
+    """
+    Flattens collect_asset_jobs() output into deduplicated {absolute_url: kind} jobs.
+    """
+    jobs: dict[str, str] = {}
+    for _tag, _attr, kind, urls in asset_jobs:
+        for absu in urls:
+            jobs.setdefault(absu, kind)
+    return jobs
+
+
+def make_session() -> requests.Session:
+    """
+    Session with a connection pool sized for the download thread pool and
+    retry/backoff on transient errors (connection resets, 429, 5xx).
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Download a web page with its CSS, JS and images for offline viewing.")
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="download assets with httpx over HTTP/2 (requires: pip install 'httpx[http2]')",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    print("=== Website Ripper (HTML + CSS + JS + images) ===")
+    start_url = normalize_url(prompt_nonempty("Enter website URL (e.g. https://example.com): "))
+    dest = os.path.abspath(os.path.expanduser(prompt_nonempty("Enter destination folder: ")))
+    ensure_dir(dest)
+
+    http2 = None
+    if args.http2:
+        try:
+            http2 = Http2Downloader()
+        except ImportError as e:
+            print(f"HTTP/2 unavailable ({e}); falling back to requests.")
+            print("Install with: python3 -m pip install 'httpx[http2]'")
+
+    session = make_session()
+    try:
+        with HostLimitedPool(MAX_WORKERS, MAX_PER_HOST) as ex:
+            rip(start_url, dest, session, ex, http2)
+    finally:
+        session.close()
+        if http2 is not None:
+            http2.close()
+
+
+def rip(start_url: str, dest: str, session: requests.Session, ex: HostLimitedPool, http2: Http2Downloader | None = None) -> None:
+    store = AssetStore(dest)
+
+    # ---- Fetch HTML ----
+    try:
+        html, final_url = fetch_text(start_url, session)
+    except requests.RequestException as e:
+        raise SystemExit(f"Failed to fetch HTML: {e}") from e
+
+    downloaded_css = []
+    downloaded_js = []
+    downloaded_img = []
+    downloaded = {"css": downloaded_css, "js": downloaded_js, "img": downloaded_img}
+
+    # ---- Phase 1: harvest asset URLs from the raw HTML and start downloading ----
+    # The regex pass is cheap; the full parse below overlaps with the downloads.
+    in_flight: dict = {}
+    submit_downloads(ex, harvest_asset_urls(html, final_url), session, store, in_flight, http2)
+
+    soup = BeautifulSoup(html, "lxml")
+
+    # Tags to rewrite later (any URL the pre-scan missed is still downloaded in
+    # phase 2), and inline <style> blocks for css/inline_styles.css
+    asset_jobs, inline_css_parts = collect_asset_jobs(soup, final_url)
+
+    # ---- Phase 2: download everything concurrently ----
+    # (downloads from the pre-scan have been running during the full parse;
+    # anything it found that the soup doesn't reference is thrown away)
+    referenced = asset_urls(asset_jobs)
+    submit_downloads(ex, referenced, session, store, in_flight, http2)
+    collect_downloads(in_flight, store, downloaded, referenced)
+
+    # ---- Phase 3: rewrite HTML references to local files ----
+    for tag, attr, _kind, urls in asset_jobs:
+        local_rels = [relpath_web(dest, store.map_url_to_local[u]) for u in urls if u in store.map_url_to_local]
+        if not local_rels:
             continue
+        if attr == "srcset":
+            tag[attr] = ", ".join(f"{local_rel} 1x" for local_rel in local_rels)
+        else:
+            tag[attr] = local_rels[0]
 
-        refs = extract_urls_from_css(css_text)
-        updated = css_text
+    # ---- Inline style blocks -> css/inline_styles.css ----
+    if inline_css_parts:
+        inline_css_rel = "css/inline_styles.css"
+        inline_css_full = os.path.join(dest, inline_css_rel)
+        write_text(inline_css_full, "\n\n/* ---- inline style separator ---- */\n\n".join(inline_css_parts))
 
-        for ref in refs:
-            absu = join_and_clean(css_base_url, ref)
-            if not absu:
+        # Ensure head exists
+        if soup.head is None:
+            if soup.html is None:
+                soup.append(soup.new_tag("html"))
+            soup.html.insert(0, soup.new_tag("head"))
+        soup.head.append(soup.new_tag("link", rel="stylesheet", href=inline_css_rel))
+
+    # ---- Parse downloaded CSS for url(...) images and @import CSS ----
+    # We will:
+    # - For each downloaded CSS: download url(...) assets that look like images
+    # - For @import: try to download additional CSS and rewrite (best-effort)
+    # Each round downloads the refs of a batch of stylesheets concurrently;
+    # newly imported stylesheets are processed in the next round.
+    pending_css = list(downloaded_css)
+    while pending_css:
+        parsed_css = []
+        css_round_jobs: dict[str, str] = {}
+
+        for _remote, css_local, css_text in pending_css:
+            css_base_url = store.map_local_to_url.get(css_local)
+            if not css_base_url:
                 continue
 
-            # If @import points to CSS, download and rewrite to local
-            if ref.lower().endswith(".css") or "text/css" in ref.lower():
-                if absu not in store.map_url_to_local:
-                    try:
-                        imported_text, imported_final = fetch_text(absu, session)
-                        imported_local = store.local_path_for("css", imported_final, "text/css")
-                        write_text(imported_local, imported_text)
-                        store.map_url_to_local[absu] = imported_local
-                        downloaded_css.append((imported_final, imported_local))
-                    except Exception:
-                        pass
-
-                if absu in store.map_url_to_local:
-                    local_rel = relpath_web(os.path.dirname(css_local), store.map_url_to_local[absu])
-                    updated = updated.replace(ref, local_rel)
+            resolved = []
+            for ref in extract_urls_from_css(css_text):
+                absu = join_and_clean(css_base_url, ref)
+                if not absu:
+                    continue
+                resolved.append((ref, absu))
+
+                # @import'ed CSS is downloaded as CSS; everything else is treated as a
+                # potential image/font and kept only if its content-type is image/*
+                if ref.lower().endswith(".css") or "text/css" in ref.lower():
+                    css_round_jobs.setdefault(absu, "css")
+                else:
+                    css_round_jobs.setdefault(absu, "img")
+
+            parsed_css.append((css_local, css_text, resolved))
+
+        seen_css = len(downloaded_css)
+        download_all(ex, css_round_jobs, session, store, downloaded, http2)
+
+        for css_local, css_text, resolved in parsed_css:
+            css_dir = os.path.dirname(css_local)
+            ref_to_local = {
+                ref: relpath_web(css_dir, store.map_url_to_local[absu])
+                for ref, absu in resolved
+                if absu in store.map_url_to_local
+            }
+            if not ref_to_local:
                 continue
 
-            # Otherwise treat as potential image/font; we’ll download if content-type is image/*
-            local_rel = download_image(absu, session, store, os.path.dirname(css_local), downloaded_img)
-            if local_rel:
-                updated = updated.replace(ref, local_rel)
+            updated = rewrite_css_refs(css_text, ref_to_local)
+            if updated != css_text:
+                write_text(css_local, updated)
 
-        if updated != css_text:
-            write_text(css_local, updated)
+        pending_css = downloaded_css[seen_css:]
 
     # ---- Save final HTML ----
     index_path = os.path.join(dest, "index.html")
@@ -462,7 +960,7 @@ def main() -> None:
 
     if downloaded_css:
         print("\nSaved CSS (local paths):")
-        for remote, local in downloaded_css[:15]:
+        for remote, local, _css_text in downloaded_css[:15]:
             print(f"  - {local}  (from {remote})")
         if len(downloaded_css) > 15:
             print(f"  ... and {len(downloaded_css)-15} more")
@@ -475,40 +973,13 @@ def main() -> None:
             print(f"  ... and {len(downloaded_js)-15} more")
 
 
-def download_image(url: str, session: requests.Session, store: AssetStore, rel_base_dir: str, downloaded_list: list) -> str | None:
-    """
-    Downloads an image-like asset and returns a relative web path (from rel_base_dir)
-    to the saved local file. rel_base_dir can be dest root (for HTML) or css file dir.
-    """
-    if url in store.map_url_to_local:
-        return relpath_web(rel_base_dir, store.map_url_to_local[url])
-
-    try:
-        data, final_u, ctype = fetch_bytes(url, session)
-    except Exception:
-        return None
-
-    if not ctype.startswith("image/"):
-        # Not an image; skip (keeps it simple/safe)
-        return None
-
-    local = store.local_path_for("img", final_u, ctype)
-    try:
-        write_bytes(local, data)
-    except Exception:
-        return None
-
-    store.map_url_to_local[url] = local
-    downloaded_list.append((final_u, local))
-    return relpath_web(rel_base_dir, local)
-
-
 if __name__ == "__main__":
     try:
         from bs4 import BeautifulSoup  # noqa: F401
-    except ImportError:
-        print("Missing dependency: beautifulsoup4")
-        print("Install with: python3 -m pip install beautifulsoup4 requests")
+        import lxml  # noqa: F401
+    except ImportError as e:
+        print(f"Missing dependency: {e.name}")
+        print("Install with: python3 -m pip install beautifulsoup4 lxml requests")
         sys.exit(1)
 
     main()